@@ -0,0 +1,28 @@
+"""JSON helpers that use ``orjson`` when it is installed.
+
+Output is indented with two spaces either way, so files written with or
+without ``orjson`` load identically.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import json
+from typing import Any
+
+if importlib.util.find_spec("orjson") is not None:
+    import orjson
+
+    def dumps(obj: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+
+    def loads(data: str | bytes) -> Any:
+        return orjson.loads(data)
+
+else:
+
+    def dumps(obj: Any) -> str:
+        return json.dumps(obj, indent=2)
+
+    def loads(data: str | bytes) -> Any:
+        return json.loads(data)
@@ -0,0 +1,63 @@
+"""Optional Numba kernels for batch scoring and evaluation.
+
+Each kernel is ``None`` when Numba is not installed; callers fall back to the
+NumPy implementations in :mod:`spamrectifier.model` and
+:mod:`spamrectifier.reporting`.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+
+import numpy as np
+
+if importlib.util.find_spec("numba") is not None:
+    from numba import njit, prange
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def score_batch(
+        row_ptr: np.ndarray,
+        col_idx: np.ndarray,
+        counts: np.ndarray,
+        log_cond: np.ndarray,
+        log_prior: np.ndarray,
+        out: np.ndarray,
+    ) -> None:
+        """Fill ``out[N, L]`` with class probabilities for CSR-encoded documents."""
+        n_labels = log_cond.shape[0]
+        for doc in prange(row_ptr.shape[0] - 1):
+            start = row_ptr[doc]
+            end = row_ptr[doc + 1]
+            best = -np.inf
+            for label in range(n_labels):
+                score = log_prior[label]
+                for k in range(start, end):
+                    score += counts[k] * log_cond[label, col_idx[k]]
+                out[doc, label] = score
+                if score > best:
+                    best = score
+            total = 0.0
+            for label in range(n_labels):
+                value = np.exp(out[doc, label] - best)
+                out[doc, label] = value
+                total += value
+            for label in range(n_labels):
+                out[doc, label] /= total
+
+    @njit(parallel=True, cache=True)
+    def confusion_counts(y_pos: np.ndarray, p_pos: np.ndarray) -> tuple[int, int, int, int]:
+        """Return ``(tp, fp, fn, tn)`` for two ``uint8`` positive-class masks."""
+        tp = 0
+        fp = 0
+        fn = 0
+        for i in prange(y_pos.shape[0]):
+            y = y_pos[i]
+            p = p_pos[i]
+            tp += y & p
+            fp += p & (1 - y)
+            fn += y & (1 - p)
+        return tp, fp, fn, y_pos.shape[0] - tp - fp - fn
+
+else:
+    score_batch = None
+    confusion_counts = None
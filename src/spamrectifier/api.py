@@ -2,15 +2,18 @@
 
 from __future__ import annotations
 
+import asyncio
+import os
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Any
+from typing import Any, AsyncIterator, Callable
 
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import HTMLResponse
+from fastapi import Depends, FastAPI, HTTPException, Request
+from fastapi.responses import HTMLResponse, Response
 from pydantic import BaseModel, Field
 
 from .model import NaiveBayesModel
-from .preview import load_preview_html
+from .preview import load_preview_bytes
 from .reporting import Metrics, build_model_card
 
 
@@ -18,44 +21,173 @@ class PredictRequest(BaseModel):
     text: str = Field(..., min_length=1)
 
 
+class PredictBatchRequest(BaseModel):
+    texts: list[str] = Field(..., min_length=1)
+
+
 class PredictResponse(BaseModel):
     prediction: str
     probabilities: dict[str, float]
 
 
+class PredictBatchResponse(BaseModel):
+    results: list[PredictResponse]
+
+
 class ExplainResponse(BaseModel):
     prediction: str
     probabilities: dict[str, float]
     top_tokens: list[dict[str, Any]]
 
 
-def create_app(model_path: str | Path) -> FastAPI:
-    model = NaiveBayesModel.load(model_path)
-    app = FastAPI(title="SpamRectifier API", version="1.0")
-    ui_html = load_preview_html()
+class _MicroBatcher:
+    """Coalesce concurrent single-text requests into one batched scoring call.
+
+    The wait is adaptive: a lone request on an idle server is scored at once,
+    while under concurrent load a batch is held open until ``max_batch_size``
+    texts are queued or ``max_wait_ms`` has elapsed since its first text.
+    """
+
+    def __init__(
+        self,
+        score: Callable[[list[str]], list[dict[str, float]]],
+        max_batch_size: int,
+        max_wait_ms: float,
+    ) -> None:
+        self._score = score
+        self._max_batch_size = max(1, max_batch_size)
+        self._max_wait = max(0.0, max_wait_ms) / 1000.0
+        self._queue: asyncio.Queue[tuple[str, asyncio.Future[dict[str, float]]]] | None = None
+        self._worker: asyncio.Task[None] | None = None
+        self._last_batch_size = 0
+
+    def start(self) -> None:
+        # The queue binds to the running loop, so build it fresh for each app lifespan.
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+
+    async def submit(self, text: str) -> dict[str, float]:
+        if self._queue is None:
+            raise RuntimeError("Batcher is not running.")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    async def _run(self) -> None:
+        assert self._queue is not None
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self._max_wait
+            while len(batch) < self._max_batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            busy = len(batch) > 1 or self._last_batch_size > 1
+            while busy and len(batch) < self._max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            self._last_batch_size = len(batch)
+
+            try:
+                results = await asyncio.to_thread(self._score, [text for text, _ in batch])
+            except Exception as exc:  # noqa: BLE001 - surfaced to every waiting caller
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+
+def get_model(request: Request) -> NaiveBayesModel:
+    return request.app.state.model
+
+
+def get_batcher(request: Request) -> _MicroBatcher:
+    return request.app.state.batcher
+
+
+def create_app(
+    model_path: str | Path,
+    max_batch_size: int = 32,
+    max_wait_ms: float = 5.0,
+    quantize: bool = False,
+) -> FastAPI:
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        # Loaded per worker at startup; the scoring matrix is memory-mapped so
+        # workers serving the same file share it through the page cache.
+        model = NaiveBayesModel.load_mmap(model_path)
+        if quantize:
+            model.quantize()
+        batcher = _MicroBatcher(model.predict_proba_batch, max_batch_size, max_wait_ms)
+        app.state.model = model
+        app.state.batcher = batcher
+        batcher.start()
+        try:
+            yield
+        finally:
+            await batcher.stop()
+
+    app = FastAPI(title="SpamRectifier API", version="1.0", lifespan=lifespan)
+    ui_html = load_preview_bytes()
 
     @app.get("/health")
     def health() -> dict[str, str]:
         return {"status": "ok"}
 
     @app.get("/", response_class=HTMLResponse)
-    def preview() -> HTMLResponse:
-        return HTMLResponse(ui_html)
+    def preview() -> Response:
+        return Response(content=ui_html, media_type="text/html")
 
     @app.post("/predict", response_model=PredictResponse)
-    def predict(request: PredictRequest) -> PredictResponse:
-        probabilities = model.predict_proba(request.text)
+    async def predict(
+        request: PredictRequest, batcher: _MicroBatcher = Depends(get_batcher)
+    ) -> PredictResponse:
+        probabilities = await batcher.submit(request.text)
         return PredictResponse(
-            prediction=model.predict(request.text), probabilities=probabilities
+            prediction=max(probabilities, key=probabilities.get),
+            probabilities=probabilities,
+        )
+
+    @app.post("/predict_batch", response_model=PredictBatchResponse)
+    def predict_batch(
+        request: PredictBatchRequest, model: NaiveBayesModel = Depends(get_model)
+    ) -> PredictBatchResponse:
+        return PredictBatchResponse(
+            results=[
+                PredictResponse(
+                    prediction=max(probabilities, key=probabilities.get),
+                    probabilities=probabilities,
+                )
+                for probabilities in model.predict_proba_batch(request.texts)
+            ]
         )
 
     @app.post("/explain", response_model=ExplainResponse)
-    def explain(request: PredictRequest) -> ExplainResponse:
+    def explain(
+        request: PredictRequest, model: NaiveBayesModel = Depends(get_model)
+    ) -> ExplainResponse:
         explanation = model.explain(request.text)
         return ExplainResponse(**explanation)
 
     @app.get("/model-card")
-    def model_card() -> dict[str, str]:
+    def model_card(model: NaiveBayesModel = Depends(get_model)) -> dict[str, str]:
         if not model.dataset_size:
             raise HTTPException(status_code=400, detail="Model metadata missing dataset size.")
         top_tokens = {label: model.top_tokens(label) for label in model.labels}
@@ -72,3 +204,13 @@ def create_app(model_path: str | Path) -> FastAPI:
         return {"card": card}
 
     return app
+
+
+def app_from_env() -> FastAPI:
+    """App factory for multi-worker uvicorn, configured through the environment."""
+    return create_app(
+        os.environ["SPAMRECTIFIER_MODEL"],
+        max_batch_size=int(os.environ.get("SPAMRECTIFIER_MAX_BATCH_SIZE", 32)),
+        max_wait_ms=float(os.environ.get("SPAMRECTIFIER_MAX_WAIT_MS", 5.0)),
+        quantize=os.environ.get("SPAMRECTIFIER_QUANTIZE") == "1",
+    )
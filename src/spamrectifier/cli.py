@@ -3,10 +3,12 @@
 from __future__ import annotations
 
 import argparse
-import json
+import os
 from pathlib import Path
 import socketserver
+from dataclasses import asdict
 
+from . import _json
 from .data import load_csv
 from .features import FeatureConfig
 from .monitoring import drift_report
@@ -24,7 +26,7 @@ def _parse_args() -> argparse.Namespace:
 
     train_parser = subparsers.add_parser("train", help="Train a model from CSV data")
     train_parser.add_argument("--data", required=True, help="Path to CSV with text,label")
-    train_parser.add_argument("--output", required=True, help="Path to write model JSON")
+    train_parser.add_argument("--output", required=True, help="Path to write the model archive")
     train_parser.add_argument("--no-bigrams", action="store_true", help="Disable bigram features")
     train_parser.add_argument(
         "--min-token-length", type=int, default=2, help="Minimum token length"
@@ -41,36 +43,62 @@ def _parse_args() -> argparse.Namespace:
     train_parser.add_argument(
         "--model-card", help="Optional path to write a model card markdown file"
     )
+    train_parser.add_argument(
+        "--workers", type=int, default=1, help="Processes used to tokenize the data"
+    )
+    train_parser.add_argument(
+        "--regex-engine",
+        choices=("re", "re2", "hyperscan"),
+        default="re",
+        help="Regex backend for bulk tokenization (falls back if not installed)",
+    )
 
     eval_parser = subparsers.add_parser("evaluate", help="Evaluate a saved model")
     eval_parser.add_argument("--data", required=True, help="Path to CSV with text,label")
-    eval_parser.add_argument("--model", required=True, help="Path to model JSON")
+    eval_parser.add_argument("--model", required=True, help="Path to a saved model")
     eval_parser.add_argument(
         "--positive-label", default="spam", help="Label treated as positive"
     )
 
     predict_parser = subparsers.add_parser("predict", help="Predict from a saved model")
-    predict_parser.add_argument("--model", required=True, help="Path to model JSON")
+    predict_parser.add_argument("--model", required=True, help="Path to a saved model")
     predict_parser.add_argument("--text", required=True, help="Text to classify")
 
     explain_parser = subparsers.add_parser("explain", help="Explain a prediction")
-    explain_parser.add_argument("--model", required=True, help="Path to model JSON")
+    explain_parser.add_argument("--model", required=True, help="Path to a saved model")
     explain_parser.add_argument("--text", required=True, help="Text to explain")
     explain_parser.add_argument(
         "--top-n", type=int, default=8, help="Number of tokens to highlight"
     )
 
     drift_parser = subparsers.add_parser("drift", help="Analyze drift on new data")
-    drift_parser.add_argument("--model", required=True, help="Path to model JSON")
+    drift_parser.add_argument("--model", required=True, help="Path to a saved model")
     drift_parser.add_argument("--data", required=True, help="Path to CSV with text,label")
     drift_parser.add_argument(
         "--top-n", type=int, default=10, help="Number of shifted tokens to show"
     )
 
     serve_parser = subparsers.add_parser("serve", help="Run FastAPI inference service")
-    serve_parser.add_argument("--model", required=True, help="Path to model JSON")
+    serve_parser.add_argument("--model", required=True, help="Path to a saved model")
     serve_parser.add_argument("--host", default="0.0.0.0", help="Bind host")
     serve_parser.add_argument("--port", type=int, default=8000, help="Bind port")
+    serve_parser.add_argument(
+        "--workers", type=int, default=1, help="Number of uvicorn worker processes"
+    )
+    serve_parser.add_argument(
+        "--max-batch-size", type=int, default=32, help="Most /predict texts scored together"
+    )
+    serve_parser.add_argument(
+        "--max-wait-ms",
+        type=float,
+        default=5.0,
+        help="Longest a /predict call waits for its batch to fill under load",
+    )
+    serve_parser.add_argument(
+        "--quantize",
+        action="store_true",
+        help="Score from an int16 copy of the model's log-probabilities",
+    )
 
     preview_parser = subparsers.add_parser("preview", help="Serve the preview UI only")
     preview_parser.add_argument("--port", type=int, default=8001, help="Bind port")
@@ -86,12 +114,21 @@ def _handle_train(args: argparse.Namespace) -> None:
         redact_emails=not args.no_email_redact,
         redact_urls=not args.no_url_redact,
         redact_numbers=args.redact_numbers,
+        engine=args.regex_engine,
     )
-    model = NaiveBayesModel.train(dataset.texts, dataset.labels, config)
+    if args.model_card:
+        # Keep the training features so the card metrics don't re-tokenize the data.
+        model, train_features = NaiveBayesModel.train_with_features(
+            dataset.texts, dataset.labels, config, workers=args.workers
+        )
+    else:
+        model = NaiveBayesModel.train(
+            dataset.texts, dataset.labels, config, workers=args.workers
+        )
     model.save(args.output)
     print(f"Model saved to {args.output}")
     if args.model_card:
-        predictions = [model.predict(text) for text in dataset.texts]
+        predictions = model.predict_from_features(train_features)
         metrics = classification_report(dataset.labels, predictions, "spam")
         card = build_model_card(
             model_name="SpamRectifier",
@@ -110,9 +147,9 @@ def _handle_train(args: argparse.Namespace) -> None:
 def _handle_evaluate(args: argparse.Namespace) -> None:
     dataset = load_csv(args.data)
     model = NaiveBayesModel.load(args.model)
-    predictions = [model.predict(text) for text in dataset.texts]
+    predictions = model.predict_batch(dataset.texts)
     metrics = classification_report(dataset.labels, predictions, args.positive_label)
-    print(json.dumps(metrics.__dict__, indent=2))
+    print(_json.dumps(asdict(metrics)))
 
 
 def _handle_predict(args: argparse.Namespace) -> None:
@@ -122,20 +159,20 @@ def _handle_predict(args: argparse.Namespace) -> None:
         "prediction": model.predict(args.text),
         "probabilities": probabilities,
     }
-    print(json.dumps(result, indent=2))
+    print(_json.dumps(result))
 
 
 def _handle_explain(args: argparse.Namespace) -> None:
     model = NaiveBayesModel.load(args.model)
     explanation = model.explain(args.text, top_n=args.top_n)
-    print(json.dumps(explanation, indent=2))
+    print(_json.dumps(explanation))
 
 
 def _handle_drift(args: argparse.Namespace) -> None:
     dataset = load_csv(args.data)
     model = NaiveBayesModel.load(args.model)
     report = drift_report(model, dataset.texts, top_n=args.top_n)
-    print(json.dumps(report, indent=2))
+    print(_json.dumps(report))
 
 
 def _handle_serve(args: argparse.Namespace) -> None:
@@ -148,7 +185,26 @@ def _handle_serve(args: argparse.Namespace) -> None:
         )
     from .api import create_app
     import uvicorn
-    app = create_app(args.model)
+    if args.workers > 1:
+        # Each worker imports the app through the factory and maps the same model file.
+        os.environ["SPAMRECTIFIER_MODEL"] = str(Path(args.model).resolve())
+        os.environ["SPAMRECTIFIER_MAX_BATCH_SIZE"] = str(args.max_batch_size)
+        os.environ["SPAMRECTIFIER_MAX_WAIT_MS"] = str(args.max_wait_ms)
+        os.environ["SPAMRECTIFIER_QUANTIZE"] = "1" if args.quantize else "0"
+        uvicorn.run(
+            "spamrectifier.api:app_from_env",
+            factory=True,
+            host=args.host,
+            port=args.port,
+            workers=args.workers,
+        )
+        return
+    app = create_app(
+        args.model,
+        max_batch_size=args.max_batch_size,
+        max_wait_ms=args.max_wait_ms,
+        quantize=args.quantize,
+    )
     uvicorn.run(app, host=args.host, port=args.port)
 
 def _handle_preview(args: argparse.Namespace) -> None:
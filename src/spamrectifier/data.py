@@ -3,8 +3,10 @@
 from __future__ import annotations
 
 import csv
+import sys
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Iterator
 
 
 @dataclass(frozen=True)
@@ -13,19 +15,35 @@ class LabeledDataset:
     labels: list[str]
 
 
-def load_csv(path: str | Path) -> LabeledDataset:
-    """Load CSV with columns text,label."""
-    texts: list[str] = []
-    labels: list[str] = []
+def iter_csv(path: str | Path) -> Iterator[tuple[str, str]]:
+    """Stream ``(text, label)`` rows from a CSV with columns text,label."""
     with Path(path).open(newline="", encoding="utf-8") as handle:
-        reader = csv.DictReader(handle)
-        if "text" not in reader.fieldnames or "label" not in reader.fieldnames:
+        reader = csv.reader(handle)
+        header = next(reader, [])
+        if "text" not in header or "label" not in header:
             raise ValueError("CSV must contain 'text' and 'label' columns")
+        text_idx = header.index("text")
+        label_idx = header.index("label")
+        width = max(text_idx, label_idx) + 1
         for row in reader:
-            text = (row.get("text") or "").strip()
-            label = (row.get("label") or "").strip()
+            if len(row) < width:
+                continue
+            text = row[text_idx].strip()
+            label = row[label_idx].strip()
             if not text or not label:
                 continue
-            texts.append(text)
-            labels.append(label)
+            # Labels repeat on every row; interning shares one object per label,
+            # so comparisons against the positive label hit the identity fast path.
+            yield text, sys.intern(label)
+
+
+def load_csv(path: str | Path) -> LabeledDataset:
+    """Load CSV with columns text,label."""
+    texts: list[str] = []
+    labels: list[str] = []
+    texts_append = texts.append
+    labels_append = labels.append
+    for text, label in iter_csv(path):
+        texts_append(text)
+        labels_append(label)
     return LabeledDataset(texts=texts, labels=labels)
@@ -2,16 +2,28 @@
 
 from __future__ import annotations
 
+import itertools
+import os
 import re
-from collections import Counter
+from collections import Counter, deque
+from concurrent.futures import Future, ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import Iterable
+from functools import lru_cache
+from typing import Callable, Iterable, Iterator, Literal
 
 TOKEN_RE = re.compile(r"[a-z0-9]+(?:['-][a-z0-9]+)?")
 EMAIL_RE = re.compile(r"\b[A-Z0-9._%+-]+@[A-Z0-9.-]+\.[A-Z]{2,}\b", re.IGNORECASE)
 URL_RE = re.compile(r"https?://\S+|www\.\S+", re.IGNORECASE)
 NUMBER_RE = re.compile(r"\b\d{2,}\b")
 
+# Group name -> (pattern, replacement) for the combined email/URL alternation;
+# earlier entries win when matches overlap.
+_REDACTIONS = {
+    "email": (EMAIL_RE, " <email> "),
+    "url": (URL_RE, " <url> "),
+}
+_NUMBER_REPLACEMENT = " <number> "
+
 
 @dataclass(frozen=True)
 class FeatureConfig:
@@ -20,17 +32,44 @@ class FeatureConfig:
     redact_emails: bool = True
     redact_urls: bool = True
     redact_numbers: bool = False
+    # Regex backend for bulk jobs; see ``features_fast``. Never changes the tokens.
+    engine: Literal["re", "re2", "hyperscan"] = "re"
+
+
+@lru_cache(maxsize=None)
+def _redaction_passes(
+    redact_emails: bool, redact_urls: bool, redact_numbers: bool
+) -> tuple[tuple[re.Pattern[str], str | Callable[[re.Match[str]], str]], ...]:
+    """Return the ``(pattern, replacement)`` substitutions to apply, in order.
+
+    Emails and URLs share one alternation. Numbers are redacted in a second
+    pass over its output, so digits glued to a redacted span (``2024https://..``)
+    still become ``<number>`` once the span is replaced.
+    """
+    enabled = dict(zip(_REDACTIONS, (redact_emails, redact_urls)))
+    groups = [
+        f"(?P<{name}>{pattern.pattern})"
+        for name, (pattern, _) in _REDACTIONS.items()
+        if enabled[name]
+    ]
+    passes = []
+    if groups:
+        passes.append((re.compile("|".join(groups), re.IGNORECASE), _redaction_replacement))
+    if redact_numbers:
+        passes.append((NUMBER_RE, _NUMBER_REPLACEMENT))
+    return tuple(passes)
+
+
+def _redaction_replacement(match: re.Match[str]) -> str:
+    return _REDACTIONS[match.lastgroup][1]
 
 
 def _redact(text: str, config: FeatureConfig) -> str:
-    redacted = text
-    if config.redact_emails:
-        redacted = EMAIL_RE.sub(" <email> ", redacted)
-    if config.redact_urls:
-        redacted = URL_RE.sub(" <url> ", redacted)
-    if config.redact_numbers:
-        redacted = NUMBER_RE.sub(" <number> ", redacted)
-    return redacted
+    for pattern, replacement in _redaction_passes(
+        config.redact_emails, config.redact_urls, config.redact_numbers
+    ):
+        text = pattern.sub(replacement, text)
+    return text
 
 
 def normalize(text: str, config: FeatureConfig) -> str:
@@ -50,5 +89,91 @@ def tokenize(text: str, config: FeatureConfig) -> list[str]:
     return tokens + bigrams
 
 
-def featurize(texts: Iterable[str], config: FeatureConfig) -> list[Counter[str]]:
-    return [Counter(tokenize(text, config)) for text in texts]
+def tokenize_counter(text: str, config: FeatureConfig) -> Counter[str]:
+    """Count the features of ``text`` without building an intermediate token list."""
+    return make_tokenizer(config)(text)
+
+
+@lru_cache(maxsize=None)
+def make_tokenizer(config: FeatureConfig) -> Callable[[str], Counter[str]]:
+    """Return ``tokenize_counter`` specialized for ``config``.
+
+    The config is read once here, so each call skips the attribute lookups
+    and redaction branches.
+    """
+    min_length = config.min_token_length
+    use_bigrams = config.use_bigrams
+    findall = TOKEN_RE.findall
+    passes = _redaction_passes(
+        config.redact_emails, config.redact_urls, config.redact_numbers
+    )
+
+    if not passes:
+
+        def normalize_fn(text: str) -> str:
+            return text.lower()
+
+    elif len(passes) == 1:
+        ((pattern, replacement),) = passes
+        sub = pattern.sub
+
+        def normalize_fn(text: str) -> str:
+            return sub(replacement, text).lower()
+
+    else:
+
+        def normalize_fn(text: str) -> str:
+            for pattern, replacement in passes:
+                text = pattern.sub(replacement, text)
+            return text.lower()
+
+    def tokenize_fn(text: str) -> Counter[str]:
+        tokens = [token for token in findall(normalize_fn(text)) if len(token) >= min_length]
+        return _count_tokens(tokens, use_bigrams)
+
+    return tokenize_fn
+
+
+def _count_tokens(tokens: list[str], use_bigrams: bool) -> Counter[str]:
+    counter = Counter(tokens)
+    if use_bigrams and len(tokens) > 1:
+        counter.update(map("_".join, zip(tokens, tokens[1:])))
+    return counter
+
+
+def featurize(texts: Iterable[str], config: FeatureConfig) -> Iterator[Counter[str]]:
+    return (tokenize_counter(text, config) for text in texts)
+
+
+def _featurize_chunk(texts: list[str], config: FeatureConfig) -> list[Counter[str]]:
+    from .features_fast import bulk_tokenizer
+
+    tokenize_fn = bulk_tokenizer(config)
+    return [tokenize_fn(text) for text in texts]
+
+
+def featurize_parallel(
+    texts: Iterable[str],
+    config: FeatureConfig,
+    workers: int | None = None,
+    chunk_size: int = 1024,
+) -> Iterator[Counter[str]]:
+    """Featurize ``texts`` across worker processes, preserving input order.
+
+    At most two chunks per worker are in flight, so a long input stream is
+    read as results are consumed rather than submitted all at once.
+    """
+    iterator = iter(texts)
+    chunks = iter(lambda: list(itertools.islice(iterator, chunk_size)), [])
+    window = 2 * (workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: deque[Future[list[Counter[str]]]] = deque(
+            pool.submit(_featurize_chunk, chunk, config)
+            for chunk in itertools.islice(chunks, window)
+        )
+        while pending:
+            features = pending.popleft().result()
+            chunk = next(chunks, None)
+            if chunk is not None:
+                pending.append(pool.submit(_featurize_chunk, chunk, config))
+            yield from features
@@ -0,0 +1,130 @@
+"""Optional regex backends for bulk tokenization.
+
+Scoring a single message always uses :mod:`re`. Corpus-sized jobs (drift
+analysis, parallel featurization) can opt into Google RE2 or Intel Hyperscan
+through ``FeatureConfig.engine``. A backend whose package is missing falls back
+along ``hyperscan -> re2 -> re``, and every backend yields exactly the tokens
+:func:`spamrectifier.features.tokenize_counter` would.
+
+Both accelerated backends only handle ASCII text themselves: their ``\\b`` and
+``\\d`` are ASCII-only while :mod:`re` is Unicode-aware, so other text is
+routed through the stdlib patterns.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+from collections import Counter
+from functools import lru_cache, partial
+from typing import Callable, Iterable, Iterator
+
+from .features import (
+    EMAIL_RE,
+    NUMBER_RE,
+    TOKEN_RE,
+    URL_RE,
+    FeatureConfig,
+    _count_tokens,
+    _redact,
+    _redaction_passes,
+    tokenize_counter,
+)
+
+ENGINES = ("re", "re2", "hyperscan")
+_FALLBACK = {"hyperscan": "re2", "re2": "re"}
+
+
+def resolve_engine(engine: str) -> str:
+    """Return ``engine`` or the nearest installed backend below it."""
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown regex engine: {engine}")
+    while engine != "re" and importlib.util.find_spec(engine) is None:
+        engine = _FALLBACK[engine]
+    return engine
+
+
+def _re2_redactor(config: FeatureConfig) -> Callable[[str], str]:
+    import re2
+
+    passes = _redaction_passes(
+        config.redact_emails, config.redact_urls, config.redact_numbers
+    )
+    if not passes:
+        return lambda text: text
+    compiled = [
+        (re2.compile(f"(?i){pattern.pattern}"), replacement) for pattern, replacement in passes
+    ]
+
+    def redact(text: str) -> str:
+        if not text.isascii():
+            return _redact(text, config)
+        for pattern, replacement in compiled:
+            text = pattern.sub(replacement, text)
+        return text
+
+    return redact
+
+
+def _hyperscan_redactor(config: FeatureConfig) -> Callable[[str], str]:
+    """Skip the substitution pass for texts Hyperscan proves contain no PII."""
+    import hyperscan
+
+    enabled = (config.redact_emails, config.redact_urls, config.redact_numbers)
+    expressions = [
+        pattern.pattern.encode("ascii")
+        for pattern, on in zip((EMAIL_RE, URL_RE, NUMBER_RE), enabled)
+        if on
+    ]
+    if not expressions:
+        return lambda text: text
+    database = hyperscan.Database()
+    database.compile(
+        expressions=expressions,
+        ids=list(range(len(expressions))),
+        elements=len(expressions),
+        flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH]
+        * len(expressions),
+    )
+
+    def on_match(pattern_id: int, start: int, end: int, flags: int, hits: list[int]) -> None:
+        hits.append(pattern_id)
+
+    def redact(text: str) -> str:
+        if text.isascii():
+            hits: list[int] = []
+            database.scan(text.encode("ascii"), match_event_handler=on_match, context=hits)
+            if not hits:
+                return text
+        return _redact(text, config)
+
+    return redact
+
+
+@lru_cache(maxsize=None)
+def bulk_tokenizer(config: FeatureConfig) -> Callable[[str], Counter[str]]:
+    """Return a ``text -> Counter`` function backed by ``config.engine``."""
+    engine = resolve_engine(config.engine)
+    if engine == "re":
+        return partial(tokenize_counter, config=config)
+    if engine == "re2":
+        import re2
+
+        redact = _re2_redactor(config)
+        findall = re2.compile(TOKEN_RE.pattern).findall
+    else:
+        redact = _hyperscan_redactor(config)
+        findall = TOKEN_RE.findall
+
+    min_length = config.min_token_length
+    use_bigrams = config.use_bigrams
+
+    def tokenize_fn(text: str) -> Counter[str]:
+        tokens = [token for token in findall(redact(text).lower()) if len(token) >= min_length]
+        return _count_tokens(tokens, use_bigrams)
+
+    return tokenize_fn
+
+
+def featurize_bulk(texts: Iterable[str], config: FeatureConfig) -> Iterator[Counter[str]]:
+    tokenize_fn = bulk_tokenizer(config)
+    return (tokenize_fn(text) for text in texts)
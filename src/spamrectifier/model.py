@@ -2,17 +2,41 @@
 
 from __future__ import annotations
 
-import json
+import hashlib
+import heapq
 import math
-from dataclasses import dataclass
+import os
+import sys
+import zipfile
+from collections import Counter
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Iterable
 
-from .features import FeatureConfig, featurize
+import numpy as np
+
+from . import _json
+from .features import FeatureConfig, featurize, featurize_parallel, make_tokenizer
 
 Label = str
 
+# Below this many documents the NumPy path beats Numba's thread fan-out.
+_NUMBA_MIN_BATCH = 256
+
+
+def _feature_stream(
+    texts: Iterable[str], config: FeatureConfig, workers: int
+) -> Iterable[Counter[str]]:
+    if workers > 1:
+        return featurize_parallel(texts, config, workers=workers)
+    return featurize(texts, config)
+
+
+def _softmax(scores: np.ndarray) -> np.ndarray:
+    exp_scores = np.exp(scores - scores.max(axis=-1, keepdims=True))
+    return exp_scores / exp_scores.sum(axis=-1, keepdims=True)
+
 
 @dataclass
 class NaiveBayesModel:
@@ -21,63 +45,264 @@ class NaiveBayesModel:
     label_counts: dict[Label, int]
     token_counts: dict[Label, dict[str, int]]
     total_tokens: dict[Label, int]
-    vocabulary: set[str]
+    vocabulary: frozenset[str]
     config: FeatureConfig
     trained_at: str
     dataset_size: int
 
+    # Model constants derived from the count tables above by ``_setup_cache``.
+    # Column ``len(vocabulary)`` of ``_log_cond`` holds the smoothed score of
+    # an unseen token so unknown tokens keep contributing as before.
+    _log_prior_map: dict[Label, float] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _log_denom_map: dict[Label, float] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _token_index: dict[str, int] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _log_cond: np.ndarray | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _log_prior: np.ndarray | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _labels_sorted: list[Label] = field(
+        default_factory=list, init=False, repr=False, compare=False
+    )
+    # Optional int16 copy of ``_log_cond``: row ``l`` decodes as
+    # ``_q_offset[l] + _log_cond_q[l] * _q_step[l]``. Set by ``quantize``.
+    _log_cond_q: np.ndarray | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _q_offset: np.ndarray | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _q_step: np.ndarray | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
     @classmethod
     def train(
-        cls, texts: Iterable[str], labels: Iterable[Label], config: FeatureConfig
+        cls,
+        texts: Iterable[str],
+        labels: Iterable[Label],
+        config: FeatureConfig,
+        workers: int = 1,
+    ) -> "NaiveBayesModel":
+        return cls._from_features(_feature_stream(texts, config, workers), labels, config)
+
+    @classmethod
+    def train_with_features(
+        cls,
+        texts: Iterable[str],
+        labels: Iterable[Label],
+        config: FeatureConfig,
+        workers: int = 1,
+    ) -> tuple["NaiveBayesModel", list[Counter[str]]]:
+        """Train like ``train`` and also return each document's feature counter."""
+        features = list(_feature_stream(texts, config, workers))
+        return cls._from_features(features, labels, config), features
+
+    @classmethod
+    def _from_features(
+        cls,
+        stream: Iterable[Counter[str]],
+        labels: Iterable[Label],
+        config: FeatureConfig,
     ) -> "NaiveBayesModel":
         label_counts: dict[Label, int] = {}
         token_counts: dict[Label, dict[str, int]] = {}
         total_tokens: dict[Label, int] = {}
         vocabulary: set[str] = set()
 
-        for features, label in zip(featurize(texts, config), labels, strict=True):
+        for features, label in zip(stream, labels, strict=True):
             label_counts[label] = label_counts.get(label, 0) + 1
-            token_bucket = token_counts.setdefault(label, {})
-            for token, count in features.items():
-                token_bucket[token] = token_bucket.get(token, 0) + count
-                vocabulary.add(token)
-            total_tokens[label] = sum(token_bucket.values())
+            bucket = token_counts.get(label)
+            if bucket is None:
+                bucket = token_counts[label] = Counter()
+            bucket.update(features)
+            vocabulary.update(features)
+            total_tokens[label] = total_tokens.get(label, 0) + sum(features.values())
 
-        return cls(
+        model = cls(
             label_counts=label_counts,
             token_counts=token_counts,
             total_tokens=total_tokens,
-            vocabulary=vocabulary,
+            vocabulary=frozenset(vocabulary),
             config=config,
             trained_at=datetime.now(timezone.utc).isoformat(),
             dataset_size=sum(label_counts.values()),
         )
+        model._setup_cache()
+        return model
 
     @property
     def labels(self) -> list[Label]:
+        if self._labels_sorted:
+            return list(self._labels_sorted)
         return sorted(self.label_counts.keys())
 
-    def predict_proba(self, text: str) -> dict[Label, float]:
-        features = featurize([text], self.config)[0]
-        vocab_size = max(len(self.vocabulary), 1)
+    def _count_matrix(self, vocab: list[str]) -> np.ndarray:
+        """Return token counts as a label-major ``(L, V)`` matrix over ``vocab``."""
+        token_index = {token: i for i, token in enumerate(vocab)}
+        counts = np.zeros((len(self.label_counts), len(vocab)), dtype=np.int64)
+        for row, label in enumerate(self.labels):
+            bucket = self.token_counts[label]
+            columns = np.fromiter(
+                (token_index[token] for token in bucket), dtype=np.intp, count=len(bucket)
+            )
+            counts[row, columns] = np.fromiter(
+                bucket.values(), dtype=np.int64, count=len(bucket)
+            )
+        return counts
+
+    def _setup_cache(
+        self, vocab: list[str] | None = None, counts: np.ndarray | None = None
+    ) -> None:
+        """Precompute label order, log priors, log denominators and scoring arrays.
+
+        ``vocab`` and ``counts`` may be passed when the caller already holds the
+        sorted vocabulary and its ``(L, V)`` count matrix.
+        """
+        if vocab is None:
+            vocab = sorted(self.vocabulary)
+        if counts is None:
+            counts = self._count_matrix(vocab)
+        labels = [sys.intern(label) for label in sorted(self.label_counts)]
+        vocab_size = max(len(vocab), 1)
         total_docs = sum(self.label_counts.values())
-        log_probs: dict[Label, float] = {}
-        for label in self.labels:
-            prior = math.log(self.label_counts[label] / total_docs)
-            log_likelihood = 0.0
-            label_total = self.total_tokens[label]
-            token_bucket = self.token_counts[label]
-            for token, count in features.items():
-                token_count = token_bucket.get(token, 0)
-                log_likelihood += count * math.log(
-                    (token_count + 1) / (label_total + vocab_size)
-                )
-            log_probs[label] = prior + log_likelihood
-
-        max_log = max(log_probs.values())
-        exp_scores = {label: math.exp(score - max_log) for label, score in log_probs.items()}
-        total = sum(exp_scores.values())
-        return {label: score / total for label, score in exp_scores.items()}
+        self._labels_sorted = labels
+        self._log_prior_map = {
+            label: math.log(self.label_counts[label] / total_docs) for label in labels
+        }
+        self._log_denom_map = {
+            label: math.log(self.total_tokens[label] + vocab_size) for label in labels
+        }
+
+        smoothed = np.zeros((len(labels), len(vocab) + 1), dtype=np.float64)
+        smoothed[:, : len(vocab)] = counts
+        smoothed += 1.0
+        log_denom = np.array([self._log_denom_map[label] for label in labels])
+        self._token_index = {token: i for i, token in enumerate(vocab)}
+        self._log_cond = np.log(smoothed) - log_denom.reshape(-1, 1)
+        self._log_prior = np.array([self._log_prior_map[label] for label in labels])
+
+    def _ensure_arrays(self) -> None:
+        # Models built directly through the constructor fill the cache on first use.
+        if self._log_cond is None:
+            self._setup_cache()
+
+    def quantize(self) -> None:
+        """Score from an int16 copy of the log-probability matrix.
+
+        Each label row is scaled onto ``[0, 32767]`` between its own min and
+        max, so a gathered column moves a quarter of the bytes. The per-term
+        error is at most half a quantization step, far below the score gaps
+        that decide a Naive Bayes argmax.
+        """
+        self._ensure_arrays()
+        offset = self._log_cond.min(axis=1)
+        spread = self._log_cond.max(axis=1) - offset
+        step = np.where(spread > 0, spread / 32767.0, 1.0)
+        self._log_cond_q = np.round(
+            (self._log_cond - offset[:, None]) / step[:, None]
+        ).astype(np.int16)
+        self._q_offset = offset
+        self._q_step = step
+
+    def _gather(self, idx: np.ndarray) -> np.ndarray:
+        """Return the ``(L, len(idx))`` log-probability columns for ``idx``."""
+        if self._log_cond_q is None:
+            return self._log_cond[:, idx]
+        columns = self._log_cond_q[:, idx] * self._q_step[:, None]
+        columns += self._q_offset[:, None]
+        return columns
+
+    def _encode(self, features: Counter[str]) -> tuple[np.ndarray, np.ndarray]:
+        """Map a token counter to ``(column, count)`` arrays over ``_log_cond``."""
+        unknown = len(self._token_index)
+        index = self._token_index
+        idx = np.fromiter(
+            (index.get(token, unknown) for token in features),
+            dtype=np.int32,
+            count=len(features),
+        )
+        cnt = np.fromiter(features.values(), dtype=np.int32, count=len(features))
+        return idx, cnt
+
+    def predict_proba(self, text: str) -> dict[Label, float]:
+        self._ensure_arrays()
+        idx, cnt = self._encode(make_tokenizer(self.config)(text))
+        scores = self._log_prior + self._gather(idx) @ cnt.astype(np.float64)
+        return dict(zip(self._labels_sorted, _softmax(scores).tolist()))
+
+    def _csr(self, batch: list[Counter[str]]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Encode counters as CSR ``(row_ptr, col_idx, counts)`` arrays."""
+        encoded = [self._encode(features) for features in batch]
+        row_ptr = np.zeros(len(batch) + 1, dtype=np.int64)
+        np.cumsum([idx.size for idx, _ in encoded], out=row_ptr[1:])
+        if not encoded:
+            return row_ptr, np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int32)
+        col_idx = np.concatenate([idx for idx, _ in encoded])
+        counts = np.concatenate([cnt for _, cnt in encoded])
+        return row_ptr, col_idx, counts
+
+    def _score_batch(self, batch: list[Counter[str]]) -> np.ndarray:
+        """Return ``(N, L)`` unnormalized log posteriors for a batch of counters."""
+        self._ensure_arrays()
+        row_ptr, col_idx, counts = self._csr(batch)
+        rows = np.repeat(np.arange(len(batch)), np.diff(row_ptr))
+        weighted = self._gather(col_idx) * counts
+        scores = np.empty((len(batch), len(self._labels_sorted)), dtype=np.float64)
+        for label_row, label_weights in enumerate(weighted):
+            scores[:, label_row] = np.bincount(
+                rows, weights=label_weights, minlength=len(batch)
+            )
+        return scores + self._log_prior
+
+    def _proba_batch(self, batch: list[Counter[str]]) -> np.ndarray:
+        """Return ``(N, L)`` class probabilities, using the Numba kernel when available."""
+        # The kernel reads the float64 matrix, so quantized models stay on NumPy.
+        if len(batch) < _NUMBA_MIN_BATCH or self._log_cond_q is not None:
+            return _softmax(self._score_batch(batch))
+        from ._kernels import score_batch
+
+        if score_batch is None:
+            return _softmax(self._score_batch(batch))
+        self._ensure_arrays()
+        row_ptr, col_idx, counts = self._csr(batch)
+        out = np.empty((len(batch), len(self._labels_sorted)), dtype=np.float64)
+        score_batch(row_ptr, col_idx, counts, self._log_cond, self._log_prior, out)
+        return out
+
+    def predict_proba_batch(self, texts: Iterable[str]) -> list[dict[Label, float]]:
+        """Score many texts with one gather over the log-probability matrix."""
+        self._ensure_arrays()
+        probabilities = self._proba_batch(list(map(make_tokenizer(self.config), texts)))
+        labels = self._labels_sorted
+        return [dict(zip(labels, row)) for row in probabilities.tolist()]
+
+    def predict_batch(self, texts: Iterable[str], workers: int = 1) -> list[Label]:
+        """Predict labels for many texts from one sparse scoring pass.
+
+        The argmax is taken on the raw log scores, which ranks labels exactly
+        as the softmax in ``predict`` does.
+        """
+        self._ensure_arrays()
+        if workers > 1:
+            return self.predict_from_features(_feature_stream(texts, self.config, workers))
+        return self.predict_from_features(map(make_tokenizer(self.config), texts))
+
+    def predict_from_features(self, features: Iterable[Counter[str]]) -> list[Label]:
+        """Predict labels for documents that are already featurized."""
+        self._ensure_arrays()
+        batch = list(features)
+        if not batch:
+            return []
+        labels = self._labels_sorted
+        return [labels[row] for row in self._score_batch(batch).argmax(axis=1).tolist()]
 
     def predict(self, text: str) -> Label:
         probabilities = self.predict_proba(text)
@@ -85,84 +310,157 @@ class NaiveBayesModel:
 
     def explain(self, text: str, top_n: int = 8) -> dict[str, object]:
         """Explain prediction by returning top contributing tokens."""
-        features = featurize([text], self.config)[0]
-        vocab_size = max(len(self.vocabulary), 1)
-        label_total = self.total_tokens
-        token_counts = self.token_counts
-
-        label_scores: dict[Label, float] = {}
-        token_contribs: dict[Label, dict[str, float]] = {}
-        for label in self.labels:
-            label_log = 0.0
-            contribs: dict[str, float] = {}
-            for token, count in features.items():
-                token_count = token_counts[label].get(token, 0)
-                contribution = count * math.log(
-                    (token_count + 1) / (label_total[label] + vocab_size)
-                )
-                contribs[token] = contribution
-                label_log += contribution
-            label_scores[label] = label_log
-            token_contribs[label] = contribs
-
-        prediction = max(label_scores, key=label_scores.get)
-        sorted_tokens = sorted(
-            token_contribs[prediction].items(), key=lambda item: item[1], reverse=True
-        )
+        self._ensure_arrays()
+        features = make_tokenizer(self.config)(text)
+        tokens = list(features)
+        idx, cnt = self._encode(features)
+        contributions = self._gather(idx) * cnt
+        scores = self._log_prior + contributions.sum(axis=1)
+
+        pred_row = int(np.argmax(scores))
+        row = contributions[pred_row]
+        # Stable, so tied contributions keep the order the tokens appear in the text.
+        top = np.argsort(-row, kind="stable")[: max(0, top_n)]
         return {
-            "prediction": prediction,
-            "probabilities": self.predict_proba(text),
+            "prediction": self._labels_sorted[pred_row],
+            "probabilities": dict(zip(self._labels_sorted, _softmax(scores).tolist())),
             "top_tokens": [
-                {"token": token, "contribution": score}
-                for token, score in sorted_tokens[:top_n]
+                {"token": tokens[i], "contribution": float(row[i])} for i in top.tolist()
             ],
         }
 
     def top_tokens(self, label: Label, top_n: int = 12) -> list[tuple[str, float]]:
-        vocab_size = max(len(self.vocabulary), 1)
-        label_total = self.total_tokens[label]
-        scored = []
-        for token, count in self.token_counts[label].items():
-            score = math.log((count + 1) / (label_total + vocab_size))
-            scored.append((token, score))
-        return sorted(scored, key=lambda item: item[1], reverse=True)[:top_n]
+        self._ensure_arrays()
+        log_denom = self._log_denom_map[label]
+        # The smoothed log-probability is monotonic in the count, so rank by count.
+        # Ties go to the alphabetically first token, so the order does not depend
+        # on dict insertion order (which differs between trained and loaded models).
+        top = heapq.nsmallest(
+            top_n, self.token_counts[label].items(), key=lambda item: (-item[1], item[0])
+        )
+        return [(token, math.log(count + 1) - log_denom) for token, count in top]
 
     def save(self, path: str | Path) -> None:
-        payload = {
-            "label_counts": self.label_counts,
-            "token_counts": self.token_counts,
-            "total_tokens": self.total_tokens,
-            "vocabulary": sorted(self.vocabulary),
+        """Write counts to a compressed ``.npz`` plus a ``<path>.meta.json`` sidecar."""
+        labels = self.labels
+        vocab = sorted(self.vocabulary)
+        metadata = {
+            "labels": labels,
             "config": {
                 "use_bigrams": self.config.use_bigrams,
                 "min_token_length": self.config.min_token_length,
                 "redact_emails": self.config.redact_emails,
                 "redact_urls": self.config.redact_urls,
                 "redact_numbers": self.config.redact_numbers,
+                "engine": self.config.engine,
             },
             "metadata": {
                 "trained_at": self.trained_at,
                 "dataset_size": self.dataset_size,
             },
         }
-        Path(path).write_text(json.dumps(payload, indent=2))
+        label_totals = [self.label_counts[label] for label in labels]
+        token_totals = [self.total_tokens[label] for label in labels]
+        with Path(path).open("wb") as handle:
+            np.savez_compressed(
+                handle,
+                counts=self._count_matrix(vocab),
+                label_counts=np.array(label_totals, dtype=np.int64),
+                total_tokens=np.array(token_totals, dtype=np.int64),
+                # Tokens never contain newlines, so one joined blob round-trips.
+                vocab=np.frombuffer("\n".join(vocab).encode("utf-8"), dtype=np.uint8),
+            )
+        _meta_path(path).write_text(_json.dumps(metadata), encoding="utf-8")
 
     @classmethod
     def load(cls, path: str | Path) -> "NaiveBayesModel":
-        payload = json.loads(Path(path).read_text())
+        if not zipfile.is_zipfile(path):
+            return cls.load_legacy_json(path)
+        with np.load(path, allow_pickle=False) as archive:
+            counts = archive["counts"]
+            label_totals = archive["label_counts"].tolist()
+            token_totals = archive["total_tokens"].tolist()
+            blob = archive["vocab"].tobytes()
+        payload = _json.loads(_meta_path(path).read_bytes())
+        labels = payload["labels"]
+        metadata = payload.get("metadata", {})
+        vocab = blob.decode("utf-8").split("\n") if blob else []
+        vocab_array = np.array(vocab, dtype=object)
+
+        token_counts: dict[Label, dict[str, int]] = {}
+        for row, label in enumerate(labels):
+            present = np.flatnonzero(counts[row])
+            token_counts[label] = dict(
+                zip(vocab_array[present].tolist(), counts[row, present].tolist())
+            )
+        model = cls(
+            label_counts=dict(zip(labels, label_totals)),
+            token_counts=token_counts,
+            total_tokens=dict(zip(labels, token_totals)),
+            vocabulary=frozenset(vocab),
+            config=FeatureConfig(**payload["config"]),
+            trained_at=metadata.get(
+                "trained_at", datetime.now(timezone.utc).isoformat()
+            ),
+            dataset_size=int(metadata.get("dataset_size", 0)),
+        )
+        model._setup_cache(vocab, counts)
+        return model
+
+    @classmethod
+    def load_legacy_json(cls, path: str | Path) -> "NaiveBayesModel":
+        """Load a model written by the JSON ``save`` of earlier releases."""
+        payload = _json.loads(Path(path).read_bytes())
         config = FeatureConfig(**payload["config"])
         metadata = payload.get("metadata", {})
-        return cls(
-            label_counts={k: int(v) for k, v in payload["label_counts"].items()},
-            token_counts={
-                label: {token: int(count) for token, count in tokens.items()}
-                for label, tokens in payload["token_counts"].items()
-            },
-            total_tokens={k: int(v) for k, v in payload["total_tokens"].items()},
-            vocabulary=set(payload["vocabulary"]),
+        # JSON already decodes counts as ints and the vocabulary was saved deduplicated.
+        model = cls(
+            label_counts=payload["label_counts"],
+            token_counts=payload["token_counts"],
+            total_tokens=payload["total_tokens"],
+            vocabulary=frozenset(payload["vocabulary"]),
             config=config,
             trained_at=metadata.get(
                 "trained_at", datetime.now(timezone.utc).isoformat()
             ),
             dataset_size=int(metadata.get("dataset_size", 0)),
         )
+        model._setup_cache()
+        return model
+
+    @classmethod
+    def load_mmap(cls, path: str | Path) -> "NaiveBayesModel":
+        """Load a model whose log-probability matrix is memory-mapped read-only.
+
+        The matrix is written once to ``<path>.log_cond.<digest>.npy``, named by
+        a hash of its contents, so every worker process serving the same model
+        shares one copy through the OS page cache and a replaced model file can
+        never map a stale matrix. If the model's directory is not writable the
+        in-memory matrix is kept.
+        """
+        model = cls.load(path)
+        log_cond = np.ascontiguousarray(model._log_cond)
+        digest = hashlib.blake2b(log_cond.tobytes(), digest_size=8).hexdigest()
+        prefix = f"{Path(path).name}.log_cond."
+        sidecar = Path(path).with_name(f"{prefix}{digest}.npy")
+        try:
+            if not sidecar.exists():
+                staging = sidecar.with_name(f"{sidecar.name}.{os.getpid()}.tmp")
+                with staging.open("wb") as handle:
+                    np.save(handle, log_cond)
+                os.replace(staging, sidecar)
+                # Matrices of earlier versions of this model are no longer used.
+                for stale in sidecar.parent.iterdir():
+                    name = stale.name
+                    if name.startswith(prefix) and name.endswith(".npy") and stale != sidecar:
+                        stale.unlink(missing_ok=True)
+            mapped = np.load(sidecar, mmap_mode="r")
+        except OSError:
+            return model
+        if mapped.shape == log_cond.shape and mapped.dtype == log_cond.dtype:
+            model._log_cond = np.asarray(mapped)
+        return model
+
+
+def _meta_path(path: str | Path) -> Path:
+    return Path(f"{path}.meta.json")
@@ -2,11 +2,13 @@
 
 from __future__ import annotations
 
-import math
 from collections import Counter
 from typing import Iterable
 
-from .features import FeatureConfig, featurize
+import numpy as np
+
+from .features import FeatureConfig
+from .features_fast import featurize_bulk
 from .model import NaiveBayesModel
 
 
@@ -17,26 +19,41 @@ def _normalize(counter: Counter[str]) -> dict[str, float]:
     return {token: count / total for token, count in counter.items()}
 
 
-def _jensen_shannon_divergence(p: dict[str, float], q: dict[str, float]) -> float:
-    keys = set(p) | set(q)
-    if not keys:
+def _aligned(
+    p: dict[str, float], q: dict[str, float]
+) -> tuple[list[str], np.ndarray, np.ndarray]:
+    """Lay both distributions out over one shared, sorted token index."""
+    keys = sorted(set(p) | set(q))
+    p_vec = np.fromiter((p.get(key, 0.0) for key in keys), dtype=np.float64, count=len(keys))
+    q_vec = np.fromiter((q.get(key, 0.0) for key in keys), dtype=np.float64, count=len(keys))
+    return keys, p_vec, q_vec
+
+
+def _jensen_shannon_divergence(p: np.ndarray, q: np.ndarray) -> float:
+    if not p.size:
         return 0.0
-    m = {key: 0.5 * (p.get(key, 0.0) + q.get(key, 0.0)) for key in keys}
+    m = 0.5 * (p + q)
     return 0.5 * (_kl_divergence(p, m) + _kl_divergence(q, m))
 
 
-def _kl_divergence(p: dict[str, float], q: dict[str, float]) -> float:
-    score = 0.0
-    for key, value in p.items():
-        if value == 0:
-            continue
-        score += value * math.log2(value / max(q.get(key, 1e-12), 1e-12))
-    return score
+def _kl_divergence(p: np.ndarray, q: np.ndarray) -> float:
+    support = p > 0
+    p = p[support]
+    return float(np.sum(p * np.log2(p / np.maximum(q[support], 1e-12))))
+
+
+def _largest(values: np.ndarray, top_n: int) -> np.ndarray:
+    """Indices of the ``top_n`` largest values, largest first."""
+    k = max(0, min(top_n, values.size))
+    if not k:
+        return np.empty(0, dtype=np.intp)
+    top = np.argpartition(values, values.size - k)[values.size - k :]
+    return top[np.argsort(-values[top], kind="stable")]
 
 
 def token_distribution(texts: Iterable[str], config: FeatureConfig) -> dict[str, float]:
     counter: Counter[str] = Counter()
-    for features in featurize(texts, config):
+    for features in featurize_bulk(texts, config):
         counter.update(features)
     return _normalize(counter)
 
@@ -54,25 +71,22 @@ def drift_report(
     texts_list = list(texts)
     model_dist = model_token_distribution(model)
     data_dist = token_distribution(texts_list, model.config)
-    js_divergence = _jensen_shannon_divergence(model_dist, data_dist)
-
-    all_tokens = set(model_dist) | set(data_dist)
-    shifts = []
-    for token in all_tokens:
-        model_prob = model_dist.get(token, 0.0)
-        data_prob = data_dist.get(token, 0.0)
-        shifts.append(
-            {
-                "token": token,
-                "model_prob": model_prob,
-                "data_prob": data_prob,
-                "delta": data_prob - model_prob,
-            }
-        )
-    shifts.sort(key=lambda item: abs(item["delta"]), reverse=True)
+    tokens, model_vec, data_vec = _aligned(model_dist, data_dist)
+    js_divergence = _jensen_shannon_divergence(model_vec, data_vec)
+
+    deltas = data_vec - model_vec
+    shifts = [
+        {
+            "token": tokens[i],
+            "model_prob": float(model_vec[i]),
+            "data_prob": float(data_vec[i]),
+            "delta": float(deltas[i]),
+        }
+        for i in _largest(np.abs(deltas), top_n).tolist()
+    ]
 
     return {
         "js_divergence": js_divergence,
-        "top_shifted_tokens": shifts[:top_n],
+        "top_shifted_tokens": shifts,
         "data_size": len(texts_list),
     }
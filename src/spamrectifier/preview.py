@@ -217,21 +217,28 @@ PREVIEW_HTML = """<!DOCTYPE html>
 """
 
 
+PREVIEW_HTML_BYTES = PREVIEW_HTML.encode("utf-8")
+_CONTENT_LENGTH = str(len(PREVIEW_HTML_BYTES))
+
+
 def load_preview_html() -> str:
     return PREVIEW_HTML
 
 
+def load_preview_bytes() -> bytes:
+    return PREVIEW_HTML_BYTES
+
+
 class PreviewRequestHandler(BaseHTTPRequestHandler):
     def do_GET(self) -> None:  # noqa: N802
         if self.path not in ("/", "/index.html"):
             self.send_error(HTTPStatus.NOT_FOUND, "Not Found")
             return
-        body = load_preview_html().encode("utf-8")
         self.send_response(HTTPStatus.OK)
         self.send_header("Content-Type", "text/html; charset=utf-8")
-        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Content-Length", _CONTENT_LENGTH)
         self.end_headers()
-        self.wfile.write(body)
+        self.wfile.write(PREVIEW_HTML_BYTES)
 
     def log_message(self, format: str, *args: object) -> None:  # noqa: A002
         return
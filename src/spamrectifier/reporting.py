@@ -2,38 +2,305 @@
 
 from __future__ import annotations
 
+import io
+import sys
+import time
 from dataclasses import dataclass
-from datetime import datetime
-from typing import Iterable
+from datetime import datetime, timezone
+from functools import cached_property, lru_cache
+from typing import Iterable, Sized
 
+import numpy as np
 
-@dataclass(frozen=True)
+# Below this many rows the Numba kernel's thread fan-out costs more than it saves.
+_MASK_MIN_ROWS = 10_000
+
+# Set-bit count of every byte value, for NumPy releases without bitwise_count.
+_BYTE_POPCOUNT = np.array([bin(byte).count("1") for byte in range(256)], dtype=np.int64)
+
+
+_CARD_HEADER = """# Model Card: {model_name}
+
+**Version**: {version}  
+**Trained At**: {trained_at}  
+**Report Generated**: {timestamp}
+
+## Overview
+- **Labels**: {label_list}
+- **Positive Label**: {positive_label}
+- **Dataset Size**: {dataset_size}
+
+## Metrics
+- **Precision**: {precision:.3f}
+- **Recall**: {recall:.3f}
+- **F1 Score**: {f1:.3f}
+- **Accuracy**: {accuracy:.3f}
+
+## Feature Highlights
+"""
+
+_CARD_FOOTER = """
+
+## Intended Use
+- High-volume SMS/email filtering.
+- Human-in-the-loop moderation workflows.
+
+## Limitations
+- Uses token frequency only; sarcasm and context can be missed.
+- Drift monitoring is recommended for new domains.
+"""
+
+# One ``(token, score)`` pair per line; %-formatting takes the pair as is.
+_TOKEN_LINE = "\n- `%s` (%.4f)"
+
+
+@dataclass(frozen=True, slots=True)
 class Metrics:
     precision: float
     recall: float
     f1: float
     accuracy: float
 
+    @classmethod
+    def from_counts(cls, tp: int, fp: int, fn: int, tn: int) -> "Metrics":
+        """Derive the metrics from confusion-matrix cell counts."""
+        if not (tp or fp or fn):
+            # The positive label never occurs, so only accuracy is defined.
+            return cls(precision=0.0, recall=0.0, f1=0.0, accuracy=1.0 if tn else 0.0)
+        total = tp + fp + fn + tn
+        precision = tp / (tp + fp) if tp + fp else 0.0
+        recall = tp / (tp + fn) if tp + fn else 0.0
+        f1 = (2 * precision * recall / (precision + recall)) if precision + recall else 0.0
+        accuracy = (tp + tn) / total if total else 0.0
+        return cls(precision=precision, recall=recall, f1=f1, accuracy=accuracy)
 
-def classification_report(
+
+def _mask_counts(y_pos: np.ndarray, p_pos: np.ndarray) -> tuple[int, int, int, int]:
+    """Return ``(tp, fp, fn, tn)`` from boolean positive-class masks."""
+    if y_pos.size >= _MASK_MIN_ROWS:
+        # Imported on first use so that importing reporting does not load Numba.
+        from ._kernels import confusion_counts as kernel
+
+        if kernel is not None:
+            return kernel(y_pos.ravel().view(np.uint8), p_pos.ravel().view(np.uint8))
+    y_bits = _pack_bits(y_pos)
+    p_bits = _pack_bits(p_pos)
+    tp = _popcount(y_bits & p_bits)
+    fp = _popcount(p_bits) - tp
+    fn = _popcount(y_bits) - tp
+    return tp, fp, fn, y_pos.size - tp - fp - fn
+
+
+def _pack_bits(mask: np.ndarray) -> np.ndarray:
+    """Pack a boolean mask 64 rows per ``uint64`` lane (zero padded)."""
+    packed = np.packbits(mask.ravel())
+    padded = np.zeros(-(-packed.size // 8) * 8, dtype=np.uint8)
+    padded[: packed.size] = packed
+    return padded.view(np.uint64)
+
+
+def _popcount(words: np.ndarray) -> int:
+    if hasattr(np, "bitwise_count"):  # NumPy >= 2.0
+        return int(np.bitwise_count(words).sum())
+    return int(_BYTE_POPCOUNT[words.view(np.uint8)].sum())
+
+
+def confusion_counts(
     labels: Iterable[str], predictions: Iterable[str], positive_label: str
+) -> tuple[int, int, int, int]:
+    """Return ``(tp, fp, fn, tn)`` for ``positive_label``.
+
+    Counts from separate batches can be summed and passed to
+    :meth:`Metrics.from_counts` instead of rescanning the whole dataset.
+    """
+    # ``==`` returns at once for identical objects, so an interned positive label
+    # is compared by pointer against labels interned by ``load_csv`` and the model.
+    # ``sys.intern`` only accepts exact ``str``; other labels are compared as given.
+    if type(positive_label) is str:
+        positive_label = sys.intern(positive_label)
+    if isinstance(labels, np.ndarray) and isinstance(predictions, np.ndarray):
+        if labels.shape != predictions.shape:
+            raise ValueError("labels and predictions must be same length")
+        # Array inputs are compared without leaving NumPy.
+        return _mask_counts(labels == positive_label, predictions == positive_label)
+
+    sized = isinstance(labels, Sized) and isinstance(predictions, Sized)
+    if sized and len(labels) != len(predictions):
+        raise ValueError("labels and predictions must be same length")
+    # Sized inputs were length-checked above, so only iterators need zip's
+    # per-element strict check.
+    pairs = zip(labels, predictions) if sized else zip(labels, predictions, strict=True)
+    # Python sequences and one-shot iterators are tallied in a single streaming
+    # pass; this beats building NumPy masks from Python strings at any size.
+    total = tp = fp = fn = 0
+    try:
+        for y, y_hat in pairs:
+            total += 1
+            if y == positive_label:
+                if y_hat == positive_label:
+                    tp += 1
+                else:
+                    fn += 1
+            elif y_hat == positive_label:
+                fp += 1
+    except ValueError as exc:
+        # Only zip's strict check means a length mismatch; errors raised by the
+        # caller's iterators or comparisons propagate unchanged.
+        if not str(exc).startswith("zip() argument"):
+            raise
+        raise ValueError("labels and predictions must be same length") from exc
+    return tp, fp, fn, total - tp - fp - fn
+
+
+class ConfusionCache:
+    """Share confusion counts between metric requests over the same inputs.
+
+    Entries are keyed by the identity of ``labels`` and ``predictions`` and keep
+    both objects alive, so an id cannot be reused while cached. Inputs must not
+    be mutated while a cache that has seen them is in use; create one cache per
+    report run.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[
+            tuple[int, int, str],
+            tuple[Iterable[str], Iterable[str], tuple[int, int, int, int]],
+        ] = {}
+
+    def get_or_compute(
+        self, labels: Iterable[str], predictions: Iterable[str], positive_label: str
+    ) -> tuple[int, int, int, int]:
+        key = (id(labels), id(predictions), positive_label)
+        entry = self._entries.get(key)
+        if entry is None:
+            counts = confusion_counts(labels, predictions, positive_label)
+            self._entries[key] = (labels, predictions, counts)
+            return counts
+        return entry[2]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+def classification_report(
+    labels: Iterable[str],
+    predictions: Iterable[str],
+    positive_label: str,
+    cache: ConfusionCache | None = None,
 ) -> Metrics:
-    labels_list = list(labels)
-    preds_list = list(predictions)
-    if len(labels_list) != len(preds_list):
+    if (
+        isinstance(labels, Sized)
+        and isinstance(predictions, Sized)
+        and len(labels) == len(predictions) == 0
+    ):
+        return Metrics(precision=0.0, recall=0.0, f1=0.0, accuracy=0.0)
+    if cache is not None:
+        return Metrics.from_counts(*cache.get_or_compute(labels, predictions, positive_label))
+    return Metrics.from_counts(*confusion_counts(labels, predictions, positive_label))
+
+
+@dataclass(frozen=True)
+class MacroReport:
+    per_class: dict[str, Metrics]
+    macro: Metrics
+
+
+def classification_report_macro(
+    labels: Iterable[str],
+    predictions: Iterable[str],
+    classes: Iterable[str] | None = None,
+) -> MacroReport:
+    """Score every class one-vs-rest from a single confusion matrix.
+
+    ``macro`` averages precision, recall and F1 over ``classes`` (default: every
+    label seen) and reports overall accuracy.
+    """
+    y = labels if isinstance(labels, np.ndarray) else np.asarray(list(labels))
+    p = predictions if isinstance(predictions, np.ndarray) else np.asarray(list(predictions))
+    if y.shape != p.shape:
         raise ValueError("labels and predictions must be same length")
+    found, inverse = np.unique(np.concatenate([y.ravel(), p.ravel()]), return_inverse=True)
+    if classes is None:
+        class_list = found.tolist()
+    else:
+        class_list = list(classes)
+        position = {label: index for index, label in enumerate(class_list)}
+        unknown = set(found.tolist()) - position.keys()
+        if unknown:
+            raise ValueError(f"labels outside classes: {sorted(unknown)}")
+        inverse = np.array([position[label] for label in found.tolist()], dtype=np.intp)[inverse]
 
-    tp = sum(1 for y, y_hat in zip(labels_list, preds_list, strict=True) if y == positive_label and y_hat == positive_label)
-    fp = sum(1 for y, y_hat in zip(labels_list, preds_list, strict=True) if y != positive_label and y_hat == positive_label)
-    fn = sum(1 for y, y_hat in zip(labels_list, preds_list, strict=True) if y == positive_label and y_hat != positive_label)
-    tn = len(labels_list) - tp - fp - fn
+    n_classes = len(class_list)
+    total = y.size
+    y_idx = inverse[:total]
+    p_idx = inverse[total:]
+    matrix = np.bincount(y_idx * n_classes + p_idx, minlength=n_classes * n_classes)
+    matrix = matrix.reshape(n_classes, n_classes)
+    tp = np.diag(matrix)
+    fp = matrix.sum(axis=0) - tp
+    fn = matrix.sum(axis=1) - tp
+    tn = total - tp - fp - fn
 
-    precision = tp / (tp + fp) if tp + fp else 0.0
-    recall = tp / (tp + fn) if tp + fn else 0.0
-    f1 = (2 * precision * recall / (precision + recall)) if precision + recall else 0.0
-    accuracy = (tp + tn) / len(labels_list) if labels_list else 0.0
+    cells = zip(tp.tolist(), fp.tolist(), fn.tolist(), tn.tolist())
+    per_class = {label: Metrics.from_counts(*counts) for label, counts in zip(class_list, cells)}
+    if not per_class:
+        return MacroReport(
+            per_class={}, macro=Metrics(precision=0.0, recall=0.0, f1=0.0, accuracy=0.0)
+        )
+    macro = Metrics(
+        precision=sum(m.precision for m in per_class.values()) / n_classes,
+        recall=sum(m.recall for m in per_class.values()) / n_classes,
+        f1=sum(m.f1 for m in per_class.values()) / n_classes,
+        accuracy=int(tp.sum()) / total if total else 0.0,
+    )
+    return MacroReport(per_class=per_class, macro=macro)
 
-    return Metrics(precision=precision, recall=recall, f1=f1, accuracy=accuracy)
+
+@dataclass(frozen=True)
+class ModelCard:
+    """Inputs of a model card; the Markdown is rendered on first access."""
+
+    model_name: str
+    version: str
+    labels: tuple[str, ...]
+    metrics: Metrics
+    dataset_size: int
+    trained_at: str
+    positive_label: str
+    top_tokens: tuple[tuple[str, tuple[tuple[str, float], ...]], ...]
+    generated_on: str
+
+    @cached_property
+    def markdown(self) -> str:
+        metrics = self.metrics
+        buffer = io.StringIO()
+        buffer.write(
+            _CARD_HEADER.format_map(
+                {
+                    "model_name": self.model_name,
+                    "version": self.version,
+                    "trained_at": self.trained_at,
+                    "timestamp": self.generated_on,
+                    "label_list": ", ".join(self.labels),
+                    "positive_label": self.positive_label,
+                    "dataset_size": self.dataset_size,
+                    "precision": metrics.precision,
+                    "recall": metrics.recall,
+                    "f1": metrics.f1,
+                    "accuracy": metrics.accuracy,
+                }
+            )
+        )
+        for index, (label, tokens) in enumerate(self.top_tokens):
+            if index:
+                buffer.write("\n\n")
+            buffer.write(f"### Top tokens for `{label}`")
+            buffer.write("".join(map(_TOKEN_LINE.__mod__, tokens)))
+        buffer.write(_CARD_FOOTER)
+        return buffer.getvalue()
+
+    def __str__(self) -> str:
+        return self.markdown
 
 
 def build_model_card(
@@ -46,40 +313,45 @@ def build_model_card(
     trained_at: str,
     positive_label: str,
     top_tokens: dict[str, list[tuple[str, float]]],
+    max_tokens_per_label: int = 20,
 ) -> str:
-    timestamp = datetime.utcnow().strftime("%Y-%m-%d")
-    label_list = ", ".join(sorted(labels))
-    token_blocks = []
-    for label, tokens in top_tokens.items():
-        token_lines = "\n".join(f"- `{token}` ({score:.4f})" for token, score in tokens)
-        token_blocks.append(f"### Top tokens for `{label}`\n{token_lines}")
-    tokens_section = "\n\n".join(token_blocks)
+    # Sections are emitted in label order, capped, and skipped when empty.
+    token_sections = tuple(
+        (label, tuple(map(tuple, tokens)))
+        for label in sorted(top_tokens)
+        if (tokens := top_tokens[label][:max_tokens_per_label])
+    )
+    card = ModelCard(
+        model_name=model_name,
+        version=version,
+        labels=_sorted_labels(frozenset(labels)),
+        metrics=metrics,
+        dataset_size=dataset_size,
+        trained_at=trained_at,
+        positive_label=positive_label,
+        top_tokens=token_sections,
+        generated_on=_today_utc(int(time.time()) // 86400),
+    )
+    return _shared_card(card).markdown
 
-    return f"""# Model Card: {model_name}
 
-**Version**: {version}  
-**Trained At**: {trained_at}  
-**Report Generated**: {timestamp}
+@lru_cache(maxsize=128)
+def _shared_card(card: ModelCard) -> ModelCard:
+    # Equal cards (including the report date) resolve to one instance, so its
+    # rendered Markdown is reused.
+    return card
 
-## Overview
-- **Labels**: {label_list}
-- **Positive Label**: {positive_label}
-- **Dataset Size**: {dataset_size}
 
-## Metrics
-- **Precision**: {metrics.precision:.3f}
-- **Recall**: {metrics.recall:.3f}
-- **F1 Score**: {metrics.f1:.3f}
-- **Accuracy**: {metrics.accuracy:.3f}
+@lru_cache(maxsize=16)
+def _sorted_labels(labels: frozenset[str]) -> tuple[str, ...]:
+    return tuple(sorted(labels))
 
-## Feature Highlights
-{tokens_section}
 
-## Intended Use
-- High-volume SMS/email filtering.
-- Human-in-the-loop moderation workflows.
+@lru_cache(maxsize=1)
+def _today_utc(day_bucket: int) -> str:
+    """Return today's UTC date; ``day_bucket`` (days since the epoch) keys the cache."""
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d")
 
-## Limitations
-- Uses token frequency only; sarcasm and context can be missed.
-- Drift monitoring is recommended for new domains.
-"""
+
+# Rendered cards are memoized; call ``build_model_card.cache_clear()`` to drop them.
+build_model_card.cache_clear = _shared_card.cache_clear
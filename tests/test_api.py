@@ -0,0 +1,117 @@
+import asyncio
+import time
+
+import pytest
+
+pytest.importorskip("fastapi")
+httpx = pytest.importorskip("httpx")
+
+from spamrectifier.api import create_app  # noqa: E402
+from spamrectifier.features import FeatureConfig  # noqa: E402
+from spamrectifier.model import NaiveBayesModel  # noqa: E402
+
+TEXTS = [
+    "Win a free prize today",
+    "Let's sync on the proposal",
+    "Claim your exclusive reward",
+    "Lunch at 1 pm?",
+]
+LABELS = ["spam", "ham", "spam", "ham"]
+PROBES = [
+    "Free reward for you",
+    "Proposal review meeting",
+    "win win win",
+    "lunch proposal",
+    "unseen words only",
+    "claim the prize",
+]
+
+
+@pytest.fixture()
+def model(tmp_path):
+    path = tmp_path / "model.npz"
+    NaiveBayesModel.train(TEXTS, LABELS, FeatureConfig()).save(path)
+    return path, NaiveBayesModel.load(path)
+
+
+def _serve(app, scenario, raise_app_exceptions=True):
+    """Run ``scenario(client, app)`` inside the app's lifespan."""
+
+    async def main():
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app, raise_app_exceptions=raise_app_exceptions)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await scenario(client, app)
+
+    return asyncio.run(main())
+
+
+def _record_batches(app, batches, fail=False):
+    score = app.state.batcher._score
+
+    def slow_score(texts):
+        batches.append(list(texts))
+        # Hold the first batch so the remaining requests queue up behind it.
+        time.sleep(0.05)
+        if fail:
+            raise RuntimeError("scorer failed")
+        return score(texts)
+
+    app.state.batcher._score = slow_score
+
+
+def test_concurrent_predict_calls_share_a_batch(model):
+    path, reference = model
+    app = create_app(path, max_batch_size=32, max_wait_ms=20.0)
+    batches = []
+
+    async def scenario(client, app):
+        _record_batches(app, batches)
+        return await asyncio.gather(
+            *(client.post("/predict", json={"text": text}) for text in PROBES)
+        )
+
+    responses = _serve(app, scenario)
+
+    assert max(len(batch) for batch in batches) > 1
+    assert sorted(text for batch in batches for text in batch) == sorted(PROBES)
+    for text, response in zip(PROBES, responses):
+        assert response.status_code == 200
+        body = response.json()
+        expected = reference.predict_proba(text)
+        assert body["prediction"] == reference.predict(text)
+        assert body["probabilities"] == pytest.approx(expected)
+
+
+def test_predict_batch_matches_predict_proba(model):
+    path, reference = model
+    app = create_app(path)
+
+    async def scenario(client, app):
+        return await client.post("/predict_batch", json={"texts": PROBES})
+
+    response = _serve(app, scenario)
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert len(results) == len(PROBES)
+    for text, result in zip(PROBES, results):
+        assert result["prediction"] == reference.predict(text)
+        assert result["probabilities"] == pytest.approx(reference.predict_proba(text))
+
+
+def test_scorer_exception_reaches_every_caller_in_the_batch(model):
+    path, _ = model
+    app = create_app(path, max_batch_size=32, max_wait_ms=20.0)
+    batches = []
+
+    async def scenario(client, app):
+        _record_batches(app, batches, fail=True)
+        return await asyncio.gather(
+            *(client.post("/predict", json={"text": text}) for text in PROBES)
+        )
+
+    responses = _serve(app, scenario, raise_app_exceptions=False)
+
+    assert max(len(batch) for batch in batches) > 1
+    assert [response.status_code for response in responses] == [500] * len(PROBES)
@@ -12,3 +12,27 @@ def test_explain_returns_contributions():
     assert explanation["prediction"] in {"spam", "ham"}
     assert "probabilities" in explanation
     assert len(explanation["top_tokens"]) <= 3
+
+
+def test_explain_agrees_with_predict():
+    texts = ["Win a free prize", "Schedule the meeting", "Meeting notes attached"]
+    labels = ["spam", "ham", "ham"]
+    model = NaiveBayesModel.train(texts, labels, FeatureConfig())
+
+    explanation = model.explain("Free prize meeting")
+
+    assert explanation["prediction"] == model.predict("Free prize meeting")
+    expected = model.predict_proba("Free prize meeting")
+    for label, value in explanation["probabilities"].items():
+        assert abs(value - expected[label]) < 1e-9
+
+
+def test_explain_breaks_ties_by_text_order():
+    texts = ["Win a free prize", "Schedule the meeting"]
+    labels = ["spam", "ham"]
+    model = NaiveBayesModel.train(texts, labels, FeatureConfig())
+
+    explanation = model.explain("zzz prize win free well-known", top_n=3)
+
+    assert explanation["prediction"] == "spam"
+    assert [item["token"] for item in explanation["top_tokens"]] == ["prize", "win", "free"]
@@ -0,0 +1,79 @@
+from collections import Counter
+
+import pytest
+
+from spamrectifier.features import (
+    FeatureConfig,
+    featurize,
+    featurize_parallel,
+    make_tokenizer,
+    normalize,
+    tokenize,
+    tokenize_counter,
+)
+from spamrectifier.features_fast import bulk_tokenizer
+
+
+@pytest.mark.parametrize("engine", ["re", "re2", "hyperscan"])
+def test_bulk_engines_match_reference_tokenizer(engine):
+    config = FeatureConfig(redact_numbers=True, engine=engine)
+    texts = [
+        "Mail me at Foo.Bar@Example.COM or visit www.example.com/offer?id=42",
+        "Call 12345 now, it's a well-known deal",
+        "Call now 2024https://x.io or 99a@b.io",
+        "café ١٢٣ naïve",
+        "",
+    ]
+
+    tokenize_fn = bulk_tokenizer(config)
+
+    for text in texts:
+        assert tokenize_fn(text) == tokenize_counter(text, config)
+
+
+@pytest.mark.parametrize(
+    "config",
+    [
+        FeatureConfig(),
+        FeatureConfig(use_bigrams=False, min_token_length=1),
+        FeatureConfig(redact_emails=False, redact_urls=False),
+        FeatureConfig(redact_numbers=True),
+        FeatureConfig(redact_emails=False, redact_urls=False, redact_numbers=True),
+    ],
+)
+def test_specialized_tokenizer_matches_tokenize(config):
+    tokenize_fn = make_tokenizer(config)
+    for text in ["Mail a@b.io, see https://x.io now 2024", "a b c", ""]:
+        assert tokenize_fn(text) == Counter(tokenize(text, config))
+
+
+def test_email_inside_url_is_redacted_as_url_only():
+    config = FeatureConfig()
+
+    assert normalize("see www.a.com/x@y.com now", config) == "see  <url>  now"
+    assert tokenize_counter("www.a.com/x@y.com", config) == Counter({"url": 1})
+
+
+def test_numbers_glued_to_a_redacted_span_are_redacted():
+    config = FeatureConfig(redact_numbers=True, use_bigrams=False)
+
+    assert normalize("Call now 2024https://x.io", config) == "call now  <number>  <url> "
+    assert tokenize_counter("2024https://x.io", config) == Counter({"number": 1, "url": 1})
+
+
+def test_featurize_parallel_matches_serial_and_bounds_reads():
+    config = FeatureConfig(redact_numbers=True)
+    texts = [f"Offer {i} at www.x{i}.io, call {i * 37}" for i in range(200)]
+    consumed = []
+
+    def stream():
+        for text in texts:
+            consumed.append(text)
+            yield text
+
+    parallel = featurize_parallel(stream(), config, workers=2, chunk_size=10)
+    first = next(parallel)
+
+    # Two workers keep at most four chunks in flight, plus the one refilled.
+    assert len(consumed) <= 5 * 10
+    assert [first, *parallel] == list(featurize(texts, config))
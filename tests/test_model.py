@@ -1,3 +1,10 @@
+import json
+import pickle
+import time
+
+import numpy as np
+import pytest
+
 from spamrectifier.features import FeatureConfig
 from spamrectifier.model import NaiveBayesModel
 
@@ -15,3 +22,200 @@ def test_train_and_predict():
 
     assert model.predict("Free reward for you") == "spam"
     assert model.predict("Proposal review meeting") == "ham"
+
+
+def test_predict_proba_batch_matches_single():
+    texts = [
+        "Win a free prize today",
+        "Let's sync on the proposal",
+        "Claim your exclusive reward",
+        "Lunch at 1 pm?",
+    ]
+    labels = ["spam", "ham", "spam", "ham"]
+    model = NaiveBayesModel.train(texts, labels, FeatureConfig())
+    probes = ["Free reward for you", "", "unseen words only", "Proposal review meeting"]
+
+    batch = model.predict_proba_batch(probes)
+
+    assert len(batch) == len(probes)
+    for text, probabilities in zip(probes, batch):
+        single = model.predict_proba(text)
+        assert probabilities.keys() == single.keys()
+        for label, value in single.items():
+            assert abs(probabilities[label] - value) < 1e-9
+    assert model.predict_batch(probes) == [model.predict(text) for text in probes]
+    assert model.predict_batch([]) == []
+
+
+def test_train_with_features_predicts_without_retokenizing():
+    texts = ["Win a free prize today", "Let's sync on the proposal", "Claim your reward"]
+    labels = ["spam", "ham", "spam"]
+
+    model, features = NaiveBayesModel.train_with_features(texts, labels, FeatureConfig())
+
+    reference = NaiveBayesModel.train(texts, labels, FeatureConfig())
+    assert model.token_counts == reference.token_counts
+    assert model.label_counts == reference.label_counts
+    assert model.predict_from_features(features) == model.predict_batch(texts)
+
+
+def test_numba_batch_kernel_matches_numpy():
+    pytest.importorskip("numba")
+    from spamrectifier.features import featurize
+    from spamrectifier.model import _NUMBA_MIN_BATCH, _softmax
+
+    model = NaiveBayesModel.train(
+        ["Win a free prize today", "Let's sync on the proposal"],
+        ["spam", "ham"],
+        FeatureConfig(),
+    )
+    probes = ["free prize", "proposal sync today", "", "unseen"] * _NUMBA_MIN_BATCH
+    batch = list(featurize(probes, model.config))
+
+    kernel = model._proba_batch(batch)
+    reference = _softmax(model._score_batch(batch))
+
+    assert np.allclose(kernel, reference)
+
+
+def test_parallel_training_matches_serial():
+    texts = ["Win a free prize today", "Let's sync on the proposal"] * 50
+    labels = ["spam", "ham"] * 50
+
+    serial = NaiveBayesModel.train(texts, labels, FeatureConfig())
+    parallel = NaiveBayesModel.train(texts, labels, FeatureConfig(), workers=2)
+
+    assert parallel.token_counts == serial.token_counts
+    assert parallel.predict_batch(texts[:4], workers=2) == serial.predict_batch(texts[:4])
+
+
+def test_trained_model_pickles():
+    texts = ["Win a free prize today", "Let's sync on the proposal"]
+    model = NaiveBayesModel.train(texts, ["spam", "ham"], FeatureConfig())
+    model.predict("free prize")
+
+    restored = pickle.loads(pickle.dumps(model))
+
+    assert restored.predict_proba("free prize") == model.predict_proba("free prize")
+
+
+def test_save_and_load_round_trip(tmp_path):
+    texts = ["Win a free prize today", "Let's sync on the proposal"]
+    model = NaiveBayesModel.train(texts, ["spam", "ham"], FeatureConfig())
+    path = tmp_path / "model.npz"
+
+    model.save(path)
+    loaded = NaiveBayesModel.load(path)
+
+    assert loaded == model
+    assert loaded.predict_proba("free proposal") == model.predict_proba("free proposal")
+    for label in ("spam", "ham"):
+        assert loaded.top_tokens(label, top_n=3) == model.top_tokens(label, top_n=3)
+
+
+def test_load_reads_legacy_json_models(tmp_path, monkeypatch):
+    texts = ["Win a free prize today", "Let's sync on the proposal", "Claim your reward"]
+    model = NaiveBayesModel.train(texts, ["spam", "ham", "spam"], FeatureConfig())
+    path = tmp_path / "model.json"
+    # The layout written by ``save`` before models moved to ``.npz``.
+    path.write_text(
+        json.dumps(
+            {
+                "label_counts": model.label_counts,
+                "token_counts": model.token_counts,
+                "total_tokens": model.total_tokens,
+                "vocabulary": sorted(model.vocabulary),
+                "config": {
+                    "use_bigrams": True,
+                    "min_token_length": 2,
+                    "redact_emails": True,
+                    "redact_urls": True,
+                    "redact_numbers": False,
+                },
+                "metadata": {"trained_at": model.trained_at, "dataset_size": 3},
+            },
+            indent=2,
+        )
+    )
+    calls = []
+    legacy = NaiveBayesModel.load_legacy_json.__func__
+
+    def record(cls, legacy_path):
+        calls.append(legacy_path)
+        return legacy(cls, legacy_path)
+
+    monkeypatch.setattr(NaiveBayesModel, "load_legacy_json", classmethod(record))
+
+    loaded = NaiveBayesModel.load(path)
+
+    assert calls == [path]
+    assert loaded == model
+    for text in ["free reward", "proposal sync", "unseen"]:
+        assert loaded.predict_proba(text) == model.predict_proba(text)
+
+
+def test_quantized_scoring_matches_float_reference():
+    texts = [
+        "Win a free prize today",
+        "Let's sync on the proposal",
+        "Claim your exclusive reward",
+        "Lunch at 1 pm?",
+    ]
+    labels = ["spam", "ham", "spam", "ham"]
+    reference = NaiveBayesModel.train(texts, labels, FeatureConfig())
+    quantized = NaiveBayesModel.train(texts, labels, FeatureConfig())
+    quantized.quantize()
+    probes = texts + ["Free reward for you", "Proposal review meeting", "unseen", ""]
+
+    for text in probes:
+        assert quantized.predict(text) == reference.predict(text)
+        expected = reference.predict_proba(text)
+        for label, value in quantized.predict_proba(text).items():
+            assert abs(value - expected[label]) < 1e-3
+    batch = quantized.predict_proba_batch(probes)
+    assert [max(p, key=p.get) for p in batch] == [reference.predict(t) for t in probes]
+
+
+def test_load_mmap_maps_matrix_and_ignores_stale_sidecars(tmp_path):
+    import os
+
+    path = tmp_path / "model.npz"
+    first = NaiveBayesModel.train(
+        ["Win a free prize", "Lunch tomorrow?"], ["spam", "ham"], FeatureConfig()
+    )
+    first.save(path)
+    old_mtime = path.stat().st_mtime
+
+    mapped = NaiveBayesModel.load_mmap(path)
+    assert isinstance(mapped._log_cond.base, np.memmap)
+    assert mapped.predict_proba("free prize") == first.predict_proba("free prize")
+
+    # Replace the model with a larger one carrying the old mtime (as ``cp -p`` would).
+    second = NaiveBayesModel.train(
+        ["Claim your exclusive reward now", "Proposal review meeting at noon", "Buy cheap pills"],
+        ["spam", "ham", "promo"],
+        FeatureConfig(),
+    )
+    second.save(path)
+    os.utime(path, (old_mtime, old_mtime))
+
+    reloaded = NaiveBayesModel.load_mmap(path)
+    assert reloaded._log_cond.shape == second._log_cond.shape
+    assert reloaded.predict_proba("exclusive reward") == second.predict_proba("exclusive reward")
+    assert len(list(tmp_path.glob("model.npz.log_cond.*.npy"))) == 1
+
+
+def test_training_time_scales_linearly_with_vocabulary():
+    def elapsed(n_docs):
+        texts = [" ".join(f"w{doc}x{i}" for i in range(10)) for doc in range(n_docs)]
+        labels = ["spam" if doc % 2 else "ham" for doc in range(n_docs)]
+        best = float("inf")
+        for _ in range(3):
+            start = time.perf_counter()
+            NaiveBayesModel.train(texts, labels, FeatureConfig())
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    # Every document adds new tokens, so rebuilding the vocabulary set per
+    # document makes 4x the data take ~16x as long instead of ~4x.
+    assert elapsed(4000) < 8 * elapsed(1000)
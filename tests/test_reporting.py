@@ -0,0 +1,140 @@
+import numpy as np
+import pytest
+
+from spamrectifier.reporting import (
+    ConfusionCache,
+    Metrics,
+    build_model_card,
+    classification_report,
+    classification_report_macro,
+    confusion_counts,
+)
+
+
+def test_classification_report_counts():
+    labels = ["spam", "spam", "ham", "ham", "spam"]
+    predictions = ["spam", "ham", "spam", "ham", "spam"]
+
+    assert confusion_counts(labels, predictions, "spam") == (2, 1, 1, 1)
+    metrics = classification_report(labels, predictions, "spam")
+    assert metrics == Metrics.from_counts(2, 1, 1, 1)
+    assert metrics.precision == 2 / 3
+    assert metrics.accuracy == 3 / 5
+    assert classification_report(np.array(labels), np.array(predictions), "spam") == metrics
+
+
+def test_counts_from_batches_add_up():
+    labels = ["spam", "ham", "spam", "ham"]
+    predictions = ["spam", "spam", "ham", "ham"]
+
+    first = confusion_counts(labels[:2], predictions[:2], "spam")
+    second = confusion_counts(labels[2:], predictions[2:], "spam")
+    combined = tuple(a + b for a, b in zip(first, second))
+
+    assert combined == confusion_counts(labels, predictions, "spam")
+
+
+def test_counts_accept_non_str_labels():
+    labels = np.array(["spam", "ham", "spam"])
+    predictions = ["spam", "spam", "ham"]
+
+    assert confusion_counts(list(labels), predictions, labels[0]) == (1, 1, 1, 0)
+    assert confusion_counts([1, 0, 1], [1, 1, 0], 1) == (1, 1, 1, 0)
+
+
+def test_confusion_cache_reuses_counts():
+    labels = ["spam", "ham", "spam"]
+    predictions = ["spam", "spam", "ham"]
+    cache = ConfusionCache()
+
+    first = classification_report(labels, predictions, "spam", cache=cache)
+    labels[0] = "ham"  # a cache hit does not rescan the inputs
+    second = classification_report(labels, predictions, "spam", cache=cache)
+
+    assert second == first
+    assert classification_report(labels, predictions, "spam") != first
+
+
+def test_numba_confusion_kernel_matches_numpy():
+    pytest.importorskip("numba")
+    from spamrectifier._kernels import confusion_counts as kernel
+
+    rng = np.random.default_rng(0)
+    y_pos = rng.random(20_000) < 0.3
+    p_pos = rng.random(20_000) < 0.4
+
+    tp = int(np.count_nonzero(y_pos & p_pos))
+    fp = int(np.count_nonzero(~y_pos & p_pos))
+    fn = int(np.count_nonzero(y_pos & ~p_pos))
+    expected = (tp, fp, fn, y_pos.size - tp - fp - fn)
+    assert kernel(y_pos.view(np.uint8), p_pos.view(np.uint8)) == expected
+
+    # 2-D label arrays above the kernel threshold are flattened before dispatch.
+    labels = np.where(y_pos, "spam", "ham").reshape(100, 200)
+    predictions = np.where(p_pos, "spam", "ham").reshape(100, 200)
+    assert confusion_counts(labels, predictions, "spam") == expected
+    assert confusion_counts(labels[:10], predictions[:10], "spam") == confusion_counts(
+        labels[:10].ravel().tolist(), predictions[:10].ravel().tolist(), "spam"
+    )
+
+
+def test_model_card_is_memoized():
+    kwargs = dict(
+        model_name="SpamRectifier",
+        version="1.0",
+        labels=["spam", "ham"],
+        metrics=Metrics(precision=1.0, recall=0.5, f1=2 / 3, accuracy=0.75),
+        dataset_size=4,
+        trained_at="2024-01-01T00:00:00+00:00",
+        positive_label="spam",
+        top_tokens={"spam": [("free", -1.5)], "ham": [("meeting", -2.0)]},
+    )
+
+    build_model_card.cache_clear()
+    card = build_model_card(**kwargs)
+
+    assert "- **Labels**: ham, spam" in card
+    assert "- `free` (-1.5000)" in card
+    assert build_model_card(**kwargs) is card
+    assert card.index("Top tokens for `ham`") < card.index("Top tokens for `spam`")
+
+
+def test_model_card_caps_and_skips_token_sections():
+    card = build_model_card(
+        model_name="SpamRectifier",
+        version="1.0",
+        labels=["spam", "ham"],
+        metrics=Metrics(precision=0.0, recall=0.0, f1=0.0, accuracy=0.0),
+        dataset_size=4,
+        trained_at="2024-01-01T00:00:00+00:00",
+        positive_label="spam",
+        top_tokens={"spam": [(f"t{i}", -1.0) for i in range(5)], "ham": []},
+        max_tokens_per_label=2,
+    )
+
+    assert "`t1`" in card and "`t2`" not in card
+    assert "Top tokens for `ham`" not in card
+
+
+def test_macro_report_matches_one_vs_rest():
+    labels = ["spam", "ham", "promo", "spam", "ham", "promo"]
+    predictions = ["spam", "spam", "promo", "ham", "ham", "spam"]
+
+    report = classification_report_macro(labels, predictions)
+
+    assert list(report.per_class) == ["ham", "promo", "spam"]
+    for label, metrics in report.per_class.items():
+        assert metrics == classification_report(labels, predictions, label)
+    assert report.macro.f1 == sum(m.f1 for m in report.per_class.values()) / 3
+    assert report.macro.accuracy == 3 / 6
+
+
+def test_streaming_counts_keep_iterator_errors():
+    def rows():
+        yield "spam"
+        raise ValueError("bad row 2")
+
+    with pytest.raises(ValueError, match="bad row 2"):
+        confusion_counts(rows(), iter(["spam", "ham"]), "spam")
+    with pytest.raises(ValueError, match="same length"):
+        confusion_counts(iter(["spam"]), iter(["spam", "ham"]), "spam")